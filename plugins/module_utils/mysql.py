@@ -60,7 +60,8 @@ def _version(cursor):
 
 def mysql_connect(module, login_user=None, login_password=None, config_file='', ssl_cert=None,
                   ssl_key=None, ssl_ca=None, db=None, cursor_class=None,
-                  connect_timeout=30, autocommit=False, config_overrides_defaults=False):
+                  connect_timeout=30, autocommit=False, config_overrides_defaults=False,
+                  check_version=True):
     config = {}
 
     if not HAS_MYSQL_PACKAGE:
@@ -120,7 +121,9 @@ def mysql_connect(module, login_user=None, login_password=None, config_file='',
         if autocommit:
             db_connection.autocommit(True)
 
-    version = _version(db_connection.cursor(**{_mysql_cursor_param: mysql_driver.cursors.DictCursor}))
+    version = None
+    if check_version:
+        version = _version(db_connection.cursor(**{_mysql_cursor_param: mysql_driver.cursors.DictCursor}))
 
     if cursor_class == 'DictCursor':
         return (db_connection.cursor(**{_mysql_cursor_param: mysql_driver.cursors.DictCursor}),
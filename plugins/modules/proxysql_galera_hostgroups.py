@@ -22,48 +22,104 @@ options:
   writer_hostgroup:
     description:
       - Id of the writer hostgroup.
+      - Required unless I(galera_hostgroups) is given.
     type: int
-    required: True
   backup_writer_hostgroup:
     description:
       - Id of the writer hostgroup.
+      - Required unless I(galera_hostgroups) is given.
     type: int
-    required: True
   reader_hostgroup:
     description:
       - Id of the reader hostgroup.
+      - Required unless I(galera_hostgroups) is given.
     type: int
-    required: True
   offline_hostgroup:
     description:
       - Id of the reader hostgroup.
+      - Required unless I(galera_hostgroups) is given.
     type: int
-    required: True
   active:
     description:
       - Id of the reader hostgroup.
+      - Required unless I(galera_hostgroups) is given.
     type: int
-    required: True
   max_writers:
     description:
       - Id of the reader hostgroup.
+      - Required unless I(galera_hostgroups) is given.
     type: int
-    required: True
   writer_is_also_reader:
     description:
       - Id of the reader hostgroup.
+      - Required unless I(galera_hostgroups) is given.
     type: int
-    required: True
   max_transactions_behind:
     description:
       - Id of the reader hostgroup.
+      - Required unless I(galera_hostgroups) is given.
     type: int
-    required: True
   comment:
     description:
       - Text field that can be used for any purposes defined by the user.
     type: str
     default: ""
+  galera_hostgroups:
+    description:
+      - List of galera hostgroups to manage in a single run, all with the
+        same I(state).
+      - The config is saved to disk and loaded to runtime at most once, after
+        every row has been applied.
+      - Mutually exclusive with I(writer_hostgroup).
+    type: list
+    elements: dict
+    suboptions:
+      writer_hostgroup:
+        description:
+          - Id of the writer hostgroup.
+        type: int
+        required: True
+      backup_writer_hostgroup:
+        description:
+          - Id of the backup writer hostgroup.
+        type: int
+        required: True
+      reader_hostgroup:
+        description:
+          - Id of the reader hostgroup.
+        type: int
+        required: True
+      offline_hostgroup:
+        description:
+          - Id of the offline hostgroup.
+        type: int
+        required: True
+      active:
+        description:
+          - Whether the galera hostgroup is active.
+        type: int
+        required: True
+      max_writers:
+        description:
+          - Maximum number of writer nodes.
+        type: int
+        required: True
+      writer_is_also_reader:
+        description:
+          - Whether writers are also placed in the reader hostgroup.
+        type: int
+        required: True
+      max_transactions_behind:
+        description:
+          - Maximum number of writesets a node may lag behind before it is
+            shunned.
+        type: int
+        required: True
+      comment:
+        description:
+          - Text field that can be used for any purposes defined by the user.
+        type: str
+        default: ""
   state:
     description:
       - When C(present) - adds the galera hostgroup, when C(absent) -
@@ -76,6 +132,9 @@ extends_documentation_fragment:
 - community.proxysql.proxysql.connectivity
 notes:
 - Supports C(check_mode).
+- The config is only saved to disk and loaded to runtime when a row was
+  actually written, so a run that changes nothing leaves any pending
+  config for M(community.proxysql.proxysql_manage_config) untouched.
 '''
 
 EXAMPLES = '''
@@ -107,6 +166,32 @@ EXAMPLES = '''
     writer_hostgroup: 3
     reader_hostgroup: 4
     state: absent
+
+# This example adds several galera hostgroups in one run, so the mysql server
+# config is saved to disk and loaded to runtime only once.
+
+- name: Add galera hostgroups
+  community.proxysql.proxysql_galera_hostgroups:
+    login_user: 'admin'
+    login_password: 'admin'
+    galera_hostgroups:
+      - writer_hostgroup: 10
+        backup_writer_hostgroup: 11
+        reader_hostgroup: 12
+        offline_hostgroup: 13
+        active: 1
+        max_writers: 1
+        writer_is_also_reader: 0
+        max_transactions_behind: 100
+      - writer_hostgroup: 20
+        backup_writer_hostgroup: 21
+        reader_hostgroup: 22
+        offline_hostgroup: 23
+        active: 1
+        max_writers: 1
+        writer_is_also_reader: 0
+        max_transactions_behind: 100
+    state: present
 '''
 
 RETURN = '''
@@ -120,11 +205,53 @@ stdout:
         "msg": "Added server to mysql_hosts",
         "galera_group": {
             "comment": "",
-            "reader_hostgroup": "1",
-            "writer_hostgroup": "2"
+            "reader_hostgroup": 1,
+            "writer_hostgroup": 2
         },
         "state": "present"
     }
+galera_groups:
+    description: The galera hostgroups modified or removed from proxysql, one
+                 entry per item of I(galera_hostgroups). Each entry holds the
+                 C(state), C(changed) and C(msg) of that row and, on
+                 create/update/delete, the C(galera_group) record as
+                 returned for a single-row run.
+    returned: When I(galera_hostgroups) is given.
+    type: list
+    elements: dict
+    "sample": [
+        {
+            "changed": true,
+            "msg": "Added server to mysql_hosts",
+            "galera_group": {
+                "writer_hostgroup": 10,
+                "backup_writer_hostgroup": 11,
+                "reader_hostgroup": 12,
+                "offline_hostgroup": 13,
+                "active": 1,
+                "max_writers": 1,
+                "writer_is_also_reader": 0,
+                "max_transactions_behind": 100,
+                "comment": ""
+            },
+            "state": "present"
+        },
+        {
+            "changed": false,
+            "galera_group": {
+                "writer_hostgroup": 20,
+                "backup_writer_hostgroup": 21,
+                "reader_hostgroup": 22,
+                "offline_hostgroup": 23,
+                "active": 1,
+                "max_writers": 1,
+                "writer_is_also_reader": 0,
+                "max_transactions_behind": 100,
+                "comment": ""
+            },
+            "state": "present"
+        }
+    ]
 '''
 
 from ansible.module_utils.basic import AnsibleModule
@@ -138,108 +265,130 @@ from ansible_collections.community.proxysql.plugins.module_utils.mysql import (
 from ansible.module_utils._text import to_native
 
 # ===========================================
-# proxysql module specific support methods.
+# proxysql module specific queries.
 #
 
+_COLUMNS = (
+    'writer_hostgroup',
+    'backup_writer_hostgroup',
+    'reader_hostgroup',
+    'offline_hostgroup',
+    'active',
+    'max_writers',
+    'writer_is_also_reader',
+    'max_transactions_behind',
+    'comment',
+)
 
-def perform_checks(module):
-    if not module.params["writer_hostgroup"] >= 0:
-        module.fail_json(
-            msg="writer_hostgroup must be a integer greater than or equal to 0"
-        )
+_SQL_SELECT_ONE = ("SELECT {0} "
+                   "FROM mysql_galera_hostgroups "
+                   "WHERE writer_hostgroup = %s").format(", ".join(_COLUMNS))
 
-    if module.params["reader_hostgroup"] < 0:
-        module.fail_json(
-            msg="reader_hostgroup must be an integer greater than or equal to 0"
-        )
+_SQL_INSERT = ("INSERT INTO mysql_galera_hostgroups ({0}) "
+               "VALUES ({1})").format(", ".join(_COLUMNS),
+                                      ", ".join(["%s"] * len(_COLUMNS)))
 
-    if module.params["reader_hostgroup"] == module.params["writer_hostgroup"]:
-        module.fail_json(
-            msg="reader_hostgroup and writer_hostgroup must be different integer values")
+_SQL_DELETE = \
+    """DELETE FROM mysql_galera_hostgroups
+       WHERE writer_hostgroup = %s"""
 
+_SQL_UPDATE = ("UPDATE mysql_galera_hostgroups "
+               "SET {0} "
+               "WHERE writer_hostgroup = %s")
 
-class ProxySQLGaleraHostgroup(object):
+# ===========================================
+# proxysql module specific support methods.
+#
 
-    def __init__(self, module, version):
-        self.state = module.params["state"]
-        self.save_to_disk = module.params["save_to_disk"]
-        self.load_to_runtime = module.params["load_to_runtime"]
-        self.writer_hostgroup = module.params["writer_hostgroup"]
-        self.backup_writer_hostgroup = module.params["backup_writer_hostgroup"]
-        self.reader_hostgroup = module.params["reader_hostgroup"]
-        self.offline_hostgroup = module.params["offline_hostgroup"]
-        self.active = module.params["active"]
-        self.max_writers = module.params["max_writers"]
-        self.writer_is_also_reader = module.params["writer_is_also_reader"]
-        self.max_transactions_behind = module.params["max_transactions_behind"]
-        self.comment = module.params["comment"]
-        self.check_mode = module.check_mode
 
-    def check_galera_group_config(self, cursor, keys):
-        query_string = \
-            """SELECT count(*) AS `galera_groups`
-               FROM mysql_galera_hostgroups
-               WHERE writer_hostgroup = %s"""
+def perform_checks(module):
+    groups = module.params["galera_hostgroups"]
+    if groups is None:
+        groups = [module.params]
+
+    for group in groups:
+        w, r = group["writer_hostgroup"], group["reader_hostgroup"]
+        if w < 0 or r < 0 or w == r:
+            module.fail_json(
+                msg=("writer_hostgroup and reader_hostgroup must be different" +
+                     " integers greater than or equal to 0")
+            )
+
+    # These columns are UNIQUE in mysql_galera_hostgroups; a repeated value
+    # would only fail once the earlier rows had already been written.
+    for column in ('writer_hostgroup', 'backup_writer_hostgroup',
+                   'reader_hostgroup', 'offline_hostgroup'):
+        values = [group[column] for group in groups]
+        if len(set(values)) != len(values):
+            module.fail_json(
+                msg="%s must be unique across galera_hostgroups" % column
+            )
+
 
-        query_data = \
-            [self.writer_hostgroup]
+def to_int(value):
+    # The admin interface returns every column as text.
+    if value is None:
+        return None
+    return int(value)
 
-        cursor.execute(query_string, query_data)
-        check_count = cursor.fetchone()
-        return (int(check_count['galera_groups']) > 0)
 
-    def get_galera_group_config(self, cursor):
-        query_string = \
-            """SELECT *
-               FROM mysql_galera_hostgroups
-               WHERE writer_hostgroup = %s"""
+class ProxySQLGaleraHostgroup(object):
 
-        query_data = \
-            [self.writer_hostgroup]
+    def __init__(self, module, version, group=None):
+        p = module.params
+        self.state = p["state"]
+        self.save_to_disk = p["save_to_disk"]
+        self.load_to_runtime = p["load_to_runtime"]
+        if group is not None:
+            p = group
+        self.writer_hostgroup = p["writer_hostgroup"]
+        self.backup_writer_hostgroup = p["backup_writer_hostgroup"]
+        self.reader_hostgroup = p["reader_hostgroup"]
+        self.offline_hostgroup = p["offline_hostgroup"]
+        self.active = p["active"]
+        self.max_writers = p["max_writers"]
+        self.writer_is_also_reader = p["writer_is_also_reader"]
+        self.max_transactions_behind = p["max_transactions_behind"]
+        self.comment = p["comment"] or ''
+        self.check_mode = module.check_mode
+        self.config_changed = False
 
-        cursor.execute(query_string, query_data)
-        galera_group = cursor.fetchone()
-        return galera_group
+    def get_galera_group_config(self, cursor):
+        cursor.execute(_SQL_SELECT_ONE, [self.writer_hostgroup])
+        row = cursor.fetchone()
+        if row is None:
+            return None
+
+        return dict((column, value if column == 'comment' else to_int(value))
+                    for column, value in zip(_COLUMNS, row))
+
+    def galera_group_config(self):
+        return {
+            'writer_hostgroup': self.writer_hostgroup,
+            'backup_writer_hostgroup': self.backup_writer_hostgroup,
+            'reader_hostgroup': self.reader_hostgroup,
+            'offline_hostgroup': self.offline_hostgroup,
+            'active': self.active,
+            'max_writers': self.max_writers,
+            'writer_is_also_reader': self.writer_is_also_reader,
+            'max_transactions_behind': self.max_transactions_behind,
+            'comment': self.comment,
+        }
+
+    def galera_group_row(self):
+        galera_group = self.galera_group_config()
+        return [galera_group[column] for column in _COLUMNS]
 
     def create_galera_group_config(self, cursor):
-        query_string = \
-            """INSERT INTO mysql_galera_hostgroups (
-               writer_hostgroup,
-               backup_writer_hostgroup,
-               reader_hostgroup,
-               offline_hostgroup,
-               active,
-               max_writers,
-               writer_is_also_reader,
-               max_transactions_behind,
-               comment)
-               VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)"""
-
-        query_data = \
-            [self.writer_hostgroup,
-             self.backup_writer_hostgroup,
-             self.reader_hostgroup,
-             self.offline_hostgroup,
-             self.active,
-             self.max_writers,
-             self.writer_is_also_reader,
-             self.max_transactions_behind,
-             self.comment or '']
-
-        cursor.execute(query_string, query_data)
-
-        return True
+        cursor.execute(_SQL_INSERT, self.galera_group_row())
+        self.config_changed = cursor.rowcount > 0
 
-    def delete_galera_group_config(self, cursor):
-        query_string = \
-            """DELETE FROM mysql_galera_hostgroups
-               WHERE writer_hostgroup = %s"""
-
-        query_data = \
-            [self.writer_hostgroup]
+        return self.config_changed
 
-        cursor.execute(query_string, query_data)
-        return True
+    def delete_galera_group_config(self, cursor):
+        cursor.execute(_SQL_DELETE, [self.writer_hostgroup])
+        self.config_changed = cursor.rowcount > 0
+        return self.config_changed
 
     def manage_config(self, cursor, state):
         if state and not self.check_mode:
@@ -248,88 +397,131 @@ class ProxySQLGaleraHostgroup(object):
             if self.load_to_runtime:
                 load_config_to_runtime(cursor, "SERVERS")
 
-    def create_galera_group(self, result, cursor):
+    def create_galera_group(self, result, cursor, batch=None):
         if not self.check_mode:
-            result['changed'] = \
-                self.create_galera_group_config(cursor)
+            if batch is None:
+                result['changed'] = \
+                    self.create_galera_group_config(cursor)
+            else:
+                batch.append(self)
+                result['changed'] = True
             result['msg'] = "Added server to mysql_hosts"
-            result['galera_group'] = \
-                self.get_galera_group_config(cursor)
-            self.manage_config(cursor,
-                               result['changed'])
+            result['galera_group'] = self.galera_group_config()
         else:
             result['changed'] = True
             result['msg'] = ("Galera group would have been added to" +
                              " mysql_galera_hostgroups, however" +
                              " check_mode is enabled.")
 
-    def update_galera_group(self, result, cursor):
-        current = self.get_galera_group_config(cursor)
-
-        if current.get('comment') != self.comment:
-            result['changed'] = True
-            result['msg'] = "Updated galera hostgroups in check_mode"
-            if not self.check_mode:
-                result['msg'] = "Updated galera hostgroups"
-                self.update_comment(cursor)
+    def update_galera_group(self, result, cursor, current):
+        desired = self.galera_group_config()
+        changes = dict((k, v) for k, v in desired.items() if current[k] != v)
 
-        if int(current.get('reader_hostgroup')) != self.reader_hostgroup:
+        if changes:
             result['changed'] = True
             result['msg'] = "Updated galera hostgroups in check_mode"
             if not self.check_mode:
                 result['msg'] = "Updated galera hostgroups"
-                self.update_reader_hostgroup(cursor)
-
-        result['galera_group'] = self.get_galera_group_config(cursor)
+                self.update_changed_fields(cursor, changes)
+                current.update(changes)
 
-        self.manage_config(cursor,
-                           result['changed'])
+        result['galera_group'] = current
 
-    def delete_galera_group(self, result, cursor):
+    def delete_galera_group(self, result, cursor, current):
         if not self.check_mode:
-            result['galera_group'] = \
-                self.get_galera_group_config(cursor)
+            result['galera_group'] = current
             result['changed'] = \
                 self.delete_galera_group_config(cursor)
             result['msg'] = "Deleted server from mysql_hosts"
-            self.manage_config(cursor,
-                               result['changed'])
         else:
             result['changed'] = True
             result['msg'] = ("Galera group would have been deleted from" +
                              " mysql_galera_hostgroups, however" +
                              " check_mode is enabled.")
 
-    def update_reader_hostgroup(self, cursor):
-        query_string = ("UPDATE mysql_galera_hostgroups "
-                        "SET reader_hostgroup = %s "
-                        "WHERE writer_hostgroup = %s")
+    def update_changed_fields(self, cursor, changes):
+        columns = sorted(changes)
+        set_clause = ", ".join("{0} = %s".format(c) for c in columns)
+
+        query_data = [changes[c] for c in columns]
+        query_data.append(self.writer_hostgroup)
 
-        cursor.execute(query_string, (self.reader_hostgroup, self.writer_hostgroup))
+        cursor.execute(_SQL_UPDATE.format(set_clause), query_data)
+        self.config_changed = cursor.rowcount > 0
+        return self.config_changed
 
-    def update_comment(self, cursor):
-        query_string = ("UPDATE mysql_galera_hostgroups "
-                        "SET comment = %s "
-                        "WHERE writer_hostgroup = %s ")
 
-        cursor.execute(query_string, (self.comment, self.writer_hostgroup))
+def create_galera_groups_config(cursor, galera_groups):
+    cursor.executemany(_SQL_INSERT,
+                       [g.galera_group_row() for g in galera_groups])
+    for galera_group in galera_groups:
+        galera_group.config_changed = cursor.rowcount > 0
 
 
 # ===========================================
 # Module execution.
 #
+def apply_galera_group(module, cursor, proxysql_galera_group, batch=None):
+    result = {}
+
+    result['state'] = proxysql_galera_group.state
+    result['changed'] = False
+
+    if proxysql_galera_group.state == "present":
+        try:
+            # The admin tables live in SQLite, which has no
+            # INSERT ... ON DUPLICATE KEY UPDATE. REPLACE would report a
+            # change even for identical rows and would silently drop other
+            # rows sharing the unique reader/backup/offline hostgroups, so
+            # the row is read first and only the difference is written.
+            current = proxysql_galera_group.get_galera_group_config(cursor)
+            if current is None:
+                proxysql_galera_group.create_galera_group(result,
+                                                          cursor,
+                                                          batch)
+            else:
+                proxysql_galera_group.update_galera_group(result, cursor,
+                                                          current)
+
+        except mysql_driver.Error as e:
+            module.fail_json(
+                msg="unable to modify galera hostgroup.. %s" % to_native(e)
+            )
+
+    elif proxysql_galera_group.state == "absent":
+        try:
+            current = proxysql_galera_group.get_galera_group_config(cursor)
+            if current is not None:
+                proxysql_galera_group.delete_galera_group(result, cursor,
+                                                          current)
+            else:
+                result['changed'] = False
+                result['msg'] = ("The galera group is already absent from the" +
+                                 " mysql_galera_hostgroups memory" +
+                                 " configuration")
+
+        except mysql_driver.Error as e:
+            module.fail_json(
+                msg="unable to delete galera hostgroup.. %s" % to_native(e)
+            )
+
+    return result
+
+
 def main():
+    group_columns = [c for c in _COLUMNS if c != 'comment']
+
+    group_spec = dict((c, dict(type='int')) for c in group_columns)
+    group_spec['comment'] = dict(type='str', default='')
+
+    galera_group_spec = dict((c, dict(spec, required=(c != 'comment')))
+                             for c, spec in group_spec.items())
+
     argument_spec = proxysql_common_argument_spec()
+    argument_spec.update(group_spec)
     argument_spec.update(
-        writer_hostgroup=dict(required=True, type='int'),
-        backup_writer_hostgroup=dict(required=True, type='int'),
-        reader_hostgroup=dict(required=True, type='int'),
-        offline_hostgroup=dict(required=True, type='int'),
-        active=dict(required=True, type='int'),
-        max_writers=dict(required=True, type='int'),
-        writer_is_also_reader=dict(required=True, type='int'),
-        max_transactions_behind=dict(required=True, type='int'),
-        comment=dict(type='str', default=''),
+        galera_hostgroups=dict(type='list', elements='dict',
+                               options=galera_group_spec),
         state=dict(default='present', choices=['present',
                                                'absent']),
         save_to_disk=dict(default=True, type='bool'),
@@ -338,14 +530,18 @@ def main():
 
     module = AnsibleModule(
         supports_check_mode=True,
-        argument_spec=argument_spec
+        argument_spec=argument_spec,
+        required_one_of=[('writer_hostgroup', 'galera_hostgroups')],
+        mutually_exclusive=[('writer_hostgroup', 'galera_hostgroups')],
+        required_together=[group_columns]
     )
 
     perform_checks(module)
 
-    login_user = module.params["login_user"]
-    login_password = module.params["login_password"]
-    config_file = module.params["config_file"]
+    p = module.params
+    login_user = p["login_user"]
+    login_password = p["login_password"]
+    config_file = p["config_file"]
 
     cursor = None
     try:
@@ -353,50 +549,52 @@ def main():
                                                  login_user,
                                                  login_password,
                                                  config_file,
-                                                 cursor_class='DictCursor')
+                                                 check_version=False)
     except mysql_driver.Error as e:
         module.fail_json(
             msg="unable to connect to ProxySQL Admin Module.. %s" % to_native(e)
         )
 
-    proxysql_galera_group = ProxySQLGaleraHostgroup(module, version)
-    result = {}
+    if p["galera_hostgroups"] is None:
+        galera_groups = [ProxySQLGaleraHostgroup(module, version)]
+        batch = None
+    else:
+        galera_groups = [ProxySQLGaleraHostgroup(module, version, group)
+                         for group in p["galera_hostgroups"]]
+        batch = []
 
-    result['state'] = proxysql_galera_group.state
-    result['changed'] = False
+    results = [apply_galera_group(module, cursor, galera_group, batch)
+               for galera_group in galera_groups]
 
-    if proxysql_galera_group.state == "present":
+    # New rows from galera_hostgroups are inserted together; the driver sends
+    # them as a single multi-row INSERT.
+    if batch:
         try:
-            if not proxysql_galera_group.check_galera_group_config(cursor,
-                                                               keys=True):
-                proxysql_galera_group.create_galera_group(result,
-                                                      cursor)
-            else:
-                proxysql_galera_group.update_galera_group(result, cursor)
-
-                result['galera_group'] = proxysql_galera_group.get_galera_group_config(cursor)
-
+            create_galera_groups_config(cursor, batch)
         except mysql_driver.Error as e:
             module.fail_json(
                 msg="unable to modify galera hostgroup.. %s" % to_native(e)
             )
 
-    elif proxysql_galera_group.state == "absent":
+    # Each row only records whether it was written; the config is saved and
+    # loaded once for the whole run.
+    config_changed = any(g.config_changed for g in galera_groups)
+    if config_changed:
         try:
-            if proxysql_galera_group.check_galera_group_config(cursor,
-                                                           keys=True):
-                proxysql_galera_group.delete_galera_group(result, cursor)
-            else:
-                result['changed'] = False
-                result['msg'] = ("The galera group is already absent from the" +
-                                 " mysql_galera_hostgroups memory" +
-                                 " configuration")
-
+            galera_groups[0].manage_config(cursor, config_changed)
         except mysql_driver.Error as e:
             module.fail_json(
-                msg="unable to delete galera hostgroup.. %s" % to_native(e)
+                msg="unable to save or load galera hostgroup config.. %s" % to_native(e)
             )
 
+    if p["galera_hostgroups"] is None:
+        result = results[0]
+    else:
+        result = {}
+        result['state'] = p["state"]
+        result['changed'] = any(r['changed'] for r in results)
+        result['galera_groups'] = results
+
     module.exit_json(**result)
 
 